@@ -4,6 +4,7 @@ import pandas as pd
 import pickle,gzip
 import json
 from collections import defaultdict
+from functools import lru_cache
 import math
 from Bio.PDB import PDBParser
 ################FUNCTIONS#################
@@ -28,13 +29,17 @@ def parse_atm_record(line):
 
     return record
 
-def read_pdb(pdbfile):
-    '''Read a pdb file per chain
+@lru_cache(maxsize=8)
+def _parse_pdb_file(pdbfile):
+    '''Read a pdb file once, collecting the per-chain data needed by both
+    read_pdb and read_pdb_pdockq
     '''
     pdb_chains = {}
     chain_coords = {}
     chain_CA_inds = {}
     chain_CB_inds = {}
+    pdockq_coords = {}
+    pdockq_plddt = {}
 
     with open(pdbfile) as file:
         for line in file:
@@ -58,11 +63,24 @@ def read_pdb(pdbfile):
                     #Reset coord ind
                     coord_ind = 0
 
+                #Get CB - CA for GLY
+                if line.startswith('ATOM') and \
+                        (record['atm_name']=='CB' or (record['atm_name']=='CA' and record['res_name']=='GLY')):
+                    pdockq_coords.setdefault(record['chain'], []).append([record['x'],record['y'],record['z']])
+                    pdockq_plddt.setdefault(record['chain'], []).append(record['B'])
+
+
+    return pdb_chains, chain_coords, chain_CA_inds, chain_CB_inds, pdockq_coords, pdockq_plddt
+
+def read_pdb(pdbfile):
+    '''Read a pdb file per chain
+    '''
+    pdb_chains, chain_coords, chain_CA_inds, chain_CB_inds, _, _ = _parse_pdb_file(pdbfile)
 
     return pdb_chains, chain_coords, chain_CA_inds, chain_CB_inds
 
 def parse_bfactor(pdb_file:str) -> np.array:
-    parser = PDBParser()
+    parser = PDBParser(QUIET=True)
     structure = parser.get_structure('PDB_structure', pdb_file)
     residue_bfactors = []
     for model in structure:
@@ -174,27 +192,11 @@ def read_pdb_pdockq(pdbfile):
     Adepted from FoldDock repo:
     https://gitlab.com/ElofssonLab/FoldDock/-/blob/main/src/pdockq.py#L34-59
     '''
-
-    chain_coords, chain_plddt = {}, {}
-    with open(pdbfile, 'r') as file:
-        for line in file:
-            if not line.startswith('ATOM'):
-                continue
-            record = parse_atm_record(line)
-            #Get CB - CA for GLY
-            if record['atm_name']=='CB' or (record['atm_name']=='CA' and record['res_name']=='GLY'):
-                if record['chain'] in [*chain_coords.keys()]:
-                    chain_coords[record['chain']].append([record['x'],record['y'],record['z']])
-                    chain_plddt[record['chain']].append(record['B'])
-                else:
-                    chain_coords[record['chain']] = [[record['x'],record['y'],record['z']]]
-                    chain_plddt[record['chain']] = [record['B']]
-
+    _, _, _, _, pdockq_coords, pdockq_plddt = _parse_pdb_file(pdbfile)
 
     #Convert to arrays
-    for chain in chain_coords:
-        chain_coords[chain] = np.array(chain_coords[chain])
-        chain_plddt[chain] = np.array(chain_plddt[chain])
+    chain_coords = {chain: np.array(coords) for chain, coords in pdockq_coords.items()}
+    chain_plddt = {chain: np.array(plddt) for chain, plddt in pdockq_plddt.items()}
 
     return chain_coords, chain_plddt
 
@@ -2,10 +2,12 @@
 
 from calculate_mpdockq import get_best_plddt, read_pdb, read_plddt, score_complex, calculate_mpDockQ, read_pdb_pdockq, calc_pdockq
 from pdb_analyser import PDBAnalyser
-from Bio.PDB import PDBParser
-from Bio.PDB.Polypeptide import PPBuilder
+import io
+import itertools
 import os
 import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from absl import flags, app, logging
 import json
 import numpy as np
@@ -13,6 +15,25 @@ import pandas as pd
 import gzip
 from typing import Tuple
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _load_json(path):
+    """Parse a json file, preferring orjson over the stdlib parser when available"""
+    if orjson is not None:
+        with open(path, 'rb') as fh:
+            return orjson.loads(fh.read())
+    with open(path) as fh:
+        return json.load(fh)
+
 flags.DEFINE_string('output_dir', None,
                     'directory where predicted models are stored')
 flags.DEFINE_float(
@@ -21,15 +42,33 @@ flags.DEFINE_integer('surface_thres', 2, 'surface threshold. must be integer')
 FLAGS = flags.FLAGS
 
 
+def _scan_inter_pae(pae_mtx, starts, ends, cutoff):
+    """Walks the inter-chain blocks and stops at the first pae < cutoff"""
+    num_chains = starts.shape[0]
+    for c1 in range(num_chains):
+        for c2 in range(c1 + 1, num_chains):
+            for i in range(starts[c1], ends[c1]):
+                for j in range(starts[c2], ends[c2]):
+                    if pae_mtx[i, j] < cutoff or pae_mtx[j, i] < cutoff:
+                        return True
+    return False
+
+
+if njit is not None:
+    _scan_inter_pae = njit(cache=True, parallel=False)(_scan_inter_pae)
+
+
 def examine_inter_pae(pae_mtx, seq_lengths, cutoff):
     """A function that checks inter-pae values in multimer prediction jobs"""
-    old_length = 0
-    mtx = pae_mtx.copy()
-    for length in seq_lengths:
-        new_length = old_length + length
-        mtx[old_length:new_length, old_length:new_length] = 50
-        old_length = new_length
-    check = np.where(mtx < cutoff)[0].size != 0
+    if njit is not None:
+        ends = np.cumsum(np.asarray(seq_lengths, dtype=np.int64))
+        starts = ends - np.asarray(seq_lengths, dtype=np.int64)
+        return bool(_scan_inter_pae(
+            np.ascontiguousarray(pae_mtx), starts, ends, cutoff))
+    chain_ids = np.repeat(
+        np.arange(len(seq_lengths), dtype=np.int32), seq_lengths)
+    inter_chain_mask = chain_ids[:, None] != chain_ids[None, :]
+    check = bool(np.any((pae_mtx < cutoff) & inter_chain_mask))
 
     return check
 
@@ -51,37 +90,49 @@ def obtain_mpdockq(work_dir):
         mpDockq_or_pdockq = "None"
     return mpDockq_or_pdockq, plddt_per_chain
 
-def obtain_pae_and_iptm(result_subdir: str, best_model: str) -> Tuple[np.array, float]:
+def obtain_pae_and_iptm(result_subdir: str, best_model: str,
+                        ranking_dict: dict = None) -> Tuple[np.array, float]:
     """A function that obtains PAE matrix and iptm score from either results pickle, zipped pickle, or pae_json"""
-    try:
-        ranking_results = json.load(
-            open(os.path.join(result_subdir, "ranking_debug.json")))
-    except FileNotFoundError as e:
-        logging.warning(f"ranking_debug.json is not found at {result_subdir}")
+    if ranking_dict is None:
+        try:
+            ranking_dict = _load_json(
+                os.path.join(result_subdir, "ranking_debug.json"))
+        except FileNotFoundError:
+            logging.warning(f"ranking_debug.json is not found at {result_subdir}")
+            ranking_dict = {}
     iptm_score = "None"
     pae_mtx = None
-    if "iptm" in ranking_results:
-        iptm_score = ranking_results['iptm'].get(best_model, None)
+    if "iptm" in ranking_dict:
+        iptm_score = ranking_dict['iptm'].get(best_model, None)
 
     if os.path.exists(f"{result_subdir}/pae_{best_model}.json"):
-        pae_results = json.load(
-            open(f"{result_subdir}/pae_{best_model}.json"))[0]['predicted_aligned_error']
-        pae_mtx = np.array(pae_results)
+        pae_results = _load_json(
+            f"{result_subdir}/pae_{best_model}.json")[0]['predicted_aligned_error']
+        # fill a preallocated float32 array straight from the nested lists;
+        # np.array would box every element on its own type-discovery pass
+        num_res = len(pae_results)
+        pae_mtx = np.fromiter(
+            itertools.chain.from_iterable(pae_results), dtype=np.float32,
+            count=num_res * num_res).reshape(num_res, num_res)
 
     if iptm_score == "None":
         try:
-            check_dict = pickle.load(
-                open(os.path.join(result_subdir, f"result_{best_model}.pkl"), 'rb'))
+            with open(os.path.join(result_subdir, f"result_{best_model}.pkl"), 'rb') as pkl_file:
+                check_dict = pickle.load(pkl_file)
             iptm_score = check_dict['iptm']
-            pae_mtx = check_dict['predicted_aligned_error']
+            pae_mtx = np.asarray(
+                check_dict['predicted_aligned_error'], dtype=np.float32)
         except FileNotFoundError:
             logging.error(os.path.join(
                 result_subdir, f"result_{best_model}.pkl")+" does not exist. Will search for pkl.gz")
             try:
-                check_dict = pickle.load(gzip.open(os.path.join(
-                result_subdir, f"result_{best_model}.pkl.gz"), 'rb'))
+                # a large read buffer keeps the decompression loop coarse-grained
+                with gzip.open(os.path.join(result_subdir, f"result_{best_model}.pkl.gz"), 'rb') as gz_file, \
+                        io.BufferedReader(gz_file, buffer_size=4 * 1024 * 1024) as buffered:
+                    check_dict = pickle.load(buffered)
                 iptm_score = check_dict['iptm']
-                pae_mtx = check_dict['predicted_aligned_error']
+                pae_mtx = np.asarray(
+                    check_dict['predicted_aligned_error'], dtype=np.float32)
             except FileNotFoundError:
                 logging.error(
                     os.path.join(
@@ -93,88 +144,94 @@ def obtain_pae_and_iptm(result_subdir: str, best_model: str) -> Tuple[np.array,
 def obtain_seq_lengths(result_subdir: str) -> list:
     """A function that obtain length of each chain in ranked_0.pdb"""
     best_result_pdb = os.path.join(result_subdir, "ranked_0.pdb")
-    seq_length = []
-    pdb_parser = PDBParser()
-    sequence_builder = PPBuilder()
     if not os.path.exists(best_result_pdb):
         raise FileNotFoundError(
             f"ranked_0.pdb is not found at {result_subdir}")
-    else:
-        structure = pdb_parser.get_structure("ranked_0", best_result_pdb)
-        seqs = sequence_builder.build_peptides(structure)
-        for seq in seqs:
-            seq_length.append(len(seq.get_sequence()))
-    return seq_length
-
+    seq_lengths = {}
+    with open(best_result_pdb, 'rb') as pdb_file:
+        for line in pdb_file:
+            # count one CA atom per residue, keeping chains in file order
+            if line.startswith(b"ATOM  ") and line[12:16] == b" CA ":
+                chain = line[21:22]
+                seq_lengths[chain] = seq_lengths.get(chain, 0) + 1
+    return list(seq_lengths.values())
+
+
+def process_job(job, output_dir, cutoff):
+    """Process one prediction folder and return its score table, or None if skipped"""
+    try:
+        logging.info(f"now processing {job}")
+        ranking_debug_path = os.path.join(output_dir, job, 'ranking_debug.json')
 
-def main(argv):
-    jobs = os.listdir(FLAGS.output_dir)
-    count = 0
-    good_jobs = []
-    output_df = pd.DataFrame()
-    pi_score_output_path = os.path.join(FLAGS.output_dir, "pi_score_outputs")
-    os.makedirs(pi_score_output_path,exist_ok=True)
-    for job in jobs:
+        if not os.path.isfile(ranking_debug_path):
+            logging.warning(f"{job} does not have ranking_debug.json. Skipped.")
+            return None
         try:
-            count += 1
-            logging.info(f"now processing {job}")
-            ranking_debug_path = os.path.join(FLAGS.output_dir, job, 'ranking_debug.json')
-            
-            if os.path.isfile(ranking_debug_path):
-                try:
-                    pdb_analyser = PDBAnalyser(os.path.join(FLAGS.output_dir, job, "ranked_0.pdb"))
-                    result_subdir = os.path.join(FLAGS.output_dir, job)
-                    
-                    with open(ranking_debug_path, 'r') as f:
-                        ranking_data = json.load(f)
+            result_subdir = os.path.join(output_dir, job)
+            pdb_analyser = PDBAnalyser(os.path.join(result_subdir, "ranked_0.pdb"))
+
+            ranking_data = _load_json(ranking_debug_path)
+            try:
+                best_model = ranking_data['order'][0]
+
+                if "iptm+ptm" in ranking_data:
+                    iptm_ptm_score = ranking_data['iptm+ptm'][best_model]
+
                     try:
-                        best_model = ranking_data['order'][0]
-                        data = ranking_data
-
-                        if "iptm+ptm" in data:
-                            iptm_ptm_score = data['iptm+ptm'][best_model]
-                            
-                            try:
-                                pae_mtx, iptm_score = obtain_pae_and_iptm(result_subdir, best_model)
-                                seq_lengths = obtain_seq_lengths(result_subdir)
-                                check = examine_inter_pae(pae_mtx, seq_lengths, cutoff=FLAGS.cutoff)
-                                mpDockq_score, plddt_per_chain = obtain_mpdockq(os.path.join(FLAGS.output_dir, job))
-                                
-                                if check:
-                                    good_jobs.append(job)
-                                    score_df = pdb_analyser(os.path.join(pi_score_output_path, job), pae_mtx, plddt_per_chain)
-                                    score_df['jobs'] = job
-                                    score_df['iptm_ptm'] = iptm_ptm_score
-                                    score_df['iptm'] = iptm_score
-                                    score_df['pDockQ/mpDockQ'] = mpDockq_score
-                                    
-                                    for i in ['pDockQ/mpDockQ', 'iptm', 'iptm_ptm', 'jobs']:
-                                        score_df.insert(0, i, score_df.pop(i))
-                                        
-                                    output_df = pd.concat([score_df, output_df])
-                            except Exception as e:
-                                logging.error(f"Error processing PAE and iPTM for job {job}: {e}")
-                        else:
-                            logging.warning(f"{job} does not seem to be a multimeric model. iptm+ptm scores are not in the ranking_debug.json Skipped")
+                        pae_mtx, iptm_score = obtain_pae_and_iptm(result_subdir, best_model,
+                                                                  ranking_dict=ranking_data)
+                        seq_lengths = obtain_seq_lengths(result_subdir)
+                        check = examine_inter_pae(pae_mtx, seq_lengths, cutoff=cutoff)
+                        mpDockq_score, plddt_per_chain = obtain_mpdockq(result_subdir)
+
+                        if check:
+                            pi_score_output_path = os.path.join(output_dir, "pi_score_outputs")
+                            score_df = pdb_analyser(os.path.join(pi_score_output_path, job), pae_mtx, plddt_per_chain)
+                            score_df['jobs'] = job
+                            score_df['iptm_ptm'] = iptm_ptm_score
+                            score_df['iptm'] = iptm_score
+                            score_df['pDockQ/mpDockQ'] = mpDockq_score
+
+                            for i in ['pDockQ/mpDockQ', 'iptm', 'iptm_ptm', 'jobs']:
+                                score_df.insert(0, i, score_df.pop(i))
+
+                            return score_df
                     except Exception as e:
-                        logging.error(f"Error getting the best model name from ranking_debug.json for job :{job} : {e}")
-                except Exception as e:
-                    logging.error(f"Error processing ranking_debug.json for job {job}: {e}")
-            else:
-                logging.warning(f"{job} does not have ranking_debug.json. Skipped.")
+                        logging.error(f"Error processing PAE and iPTM for job {job}: {e}")
+                else:
+                    logging.warning(f"{job} does not seem to be a multimeric model. iptm+ptm scores are not in the ranking_debug.json Skipped")
+            except Exception as e:
+                logging.error(f"Error getting the best model name from ranking_debug.json for job :{job} : {e}")
         except Exception as e:
-            logging.error(f"Error processing job {job}: {e}")
-        finally:
-            logging.info(f"done for {job} {count} out of {len(jobs)} finished.")
+            logging.error(f"Error processing ranking_debug.json for job {job}: {e}")
+    except Exception as e:
+        logging.error(f"Error processing job {job}: {e}")
+    finally:
+        logging.info(f"done for {job}")
+    return None
+
+
+def main(argv):
+    # scandir caches the file type, saving one stat call per entry
+    with os.scandir(FLAGS.output_dir) as entries:
+        jobs = [entry.name for entry in entries if entry.is_dir()]
+    pi_score_output_path = os.path.join(FLAGS.output_dir, "pi_score_outputs")
+    os.makedirs(pi_score_output_path,exist_ok=True)
+    # jobs are independent of each other: fan them out across all cores
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(
+            partial(process_job, output_dir=FLAGS.output_dir, cutoff=FLAGS.cutoff), jobs))
+    score_dfs = [df for df in results if df is not None]
 
-    if len(good_jobs) == 0:
+    if len(score_dfs) == 0:
         logging.info(
             f"Unfortunately, none of your protein models had at least one PAE on the interface below your cutoff value : {FLAGS.cutoff}.\n Please consider using a larger cutoff.")
     else:
+        output_df = pd.concat(score_dfs)
         unwanted_columns = ['pdb',' pvalue', 'pvalue']
-        for c in unwanted_columns:
-            if c in output_df:
-                output_df = output_df.drop(columns=c)
+        columns_to_drop = [c for c in unwanted_columns if c in output_df.columns]
+        if columns_to_drop:
+            output_df = output_df.drop(columns=columns_to_drop)
         output_df = output_df.sort_values(by='iptm', ascending= False)
         if "Hydrophobhic" in output_df.columns:
             output_df = output_df.rename(columns={"Hydrophobhic" : "Hydrophobic"})
@@ -34,7 +34,7 @@ class PDBAnalyser:
             raise FileNotFoundError(f"ranked_0.pdb not found in this folder. Please remove this folder and rerun the pipeline again.")
         else:
             self.pdb_pandas = PandasPdb().read_pdb(pdb_file_path)
-            self.pdb = PDBParser().get_structure("ranked_0", pdb_file_path)[0]
+            self.pdb = PDBParser(QUIET=True).get_structure("ranked_0", pdb_file_path)[0]
         
         self.pdb_df = self.pdb_pandas.df['ATOM']
         self.chain_combinations = {}
@@ -280,7 +280,9 @@ class PDBAnalyser:
                 #    return self._handle_pi_score_error(result, command, result.stderr)
 
                 # Read the results from the temporary directory
-                csv_files = [f for f in os.listdir(temp_dir) if f.endswith('.csv')]
+                with os.scandir(temp_dir) as entries:
+                    csv_files = [entry.name for entry in entries
+                                 if entry.is_file() and entry.name.endswith('.csv')]
                 if not csv_files:
                     return self._default_dataframe()
 
@@ -309,7 +311,7 @@ class PDBAnalyser:
         if the distance between two C-Beta is smaller than cutoff
 
         """
-        output_df = pd.DataFrame()
+        measurement_dfs = []
         if type(self.chain_combinations) != dict:
             print(
                 f"Your PDB structure seems to be a monomeric structure. The programme will stop.")
@@ -356,6 +358,7 @@ class PDBAnalyser:
                     "binding_energy": [binding_energy],
                     "interface": [f"{chain_1_id}_{chain_2_id}"]
                 })
-                output_df = pd.concat([output_df, other_measurements_df])
+                measurement_dfs.append(other_measurements_df)
 
+        output_df = pd.concat(measurement_dfs, ignore_index=True)
         return pd.merge(output_df, pi_score_df, how='left', on='interface')
@@ -21,17 +21,15 @@ from alphafold.common.protein import _from_bio_structure, to_mmcif
 FLAGS = flags.FLAGS
 
 
-def save_seqres(code, chain, s, path, duplicate):
+def format_seqres(code, chain, s, duplicate):
     """
     o code - four letter PDB-like code
     o chain - chain ID
     o s - sequence
-    o path - path to the pdb_seqresi, unique for each chain
+    o duplicate - whether to emit the entry under four duplicated codes
     Returns:
-        o Path to the file
+        o SEQRES entries as a single string
     """
-    fn = path / 'pdb_seqres.txt'
-
     seqres_entries = []
     if duplicate:
         for i in range(1, 5):
@@ -40,13 +38,11 @@ def save_seqres(code, chain, s, path, duplicate):
     else:
         seqres_entries.append(f">{code}_{chain} mol:protein length:{len(s)}\n{s}\n")
 
-    with open(fn, 'a') as f:
-        for entry in seqres_entries:
-            logging.info(f'Saving SEQRES for chain {chain} to {fn} with code {entry.split()[0][1:]}!')
-            logging.debug(entry)
-            f.write(entry)
+    for entry in seqres_entries:
+        logging.info(f'Formatted SEQRES for chain {chain} with code {entry.split()[0][1:]}!')
+        logging.debug(entry)
 
-    return fn
+    return ''.join(seqres_entries)
 
 
 def generate_code(filename):
@@ -62,10 +58,15 @@ def generate_code(filename):
 def parse_code(template):
     # Check that the code is 4 letters
     code = Path(template).stem
-    with open(template, "r") as f:
-        for line in f:
-            if line.startswith("_entry.id"):
-                code = line.split()[1]
+    # _entry.id sits in the mmCIF header, so stop at the first hit and cap
+    # the scan so PDB templates without the tag don't force a full read
+    with open(template, "rb") as f:
+        for line_number, line in enumerate(f):
+            if line.startswith(b"_entry.id"):
+                code = line.split()[1].decode()
+                break
+            if line_number >= 200:
+                break
 
     # Generate a deterministic 4-character code if needed
     if len(code) != 4:
@@ -75,15 +76,13 @@ def parse_code(template):
 
 
 def create_dir_and_remove_files(dir_path, files_to_remove=[]):
-    try:
-        Path(dir_path).mkdir(parents=True)
-    except FileExistsError:
+    dir_path = Path(dir_path)
+    if dir_path.exists():
         logging.info(f"{dir_path} already exists!")
         logging.info("The existing database will be overwritten!")
         for f in files_to_remove:
-            target_file = dir_path / Path(f)
-            if target_file.exists():
-                target_file.unlink()
+            (dir_path / f).unlink(missing_ok=True)
+    dir_path.mkdir(parents=True, exist_ok=True)
 
 
 def create_tree(pdb_mmcif_dir, mmcif_dir, seqres_dir, templates_dir):
@@ -123,10 +122,12 @@ def copy_file_exclude_lines(starting_with, src, dst):
             if not line.startswith(starting_with):
                 outfile.write(line)
 
-def _prepare_template(template, code, chain_id, mmcif_dir, seqres_dir, templates_dir,
+def _prepare_template(template, code, chain_id, mmcif_dir, templates_dir,
                       threshold_clashes, hb_allowance, plddt_threshold, number_of_templates):
     """
     Process and prepare each template.
+    Returns:
+        o SEQRES entries of the template chain as a string
     """
     duplicate = number_of_templates == 1
     new_template = templates_dir / Path(code + Path(template).suffix)
@@ -137,8 +138,7 @@ def _prepare_template(template, code, chain_id, mmcif_dir, seqres_dir, templates
     mmcif_obj = MmcifChainFiltered(new_template, code, chain_id)
     # Determine the full sequence
     seqres = mmcif_obj.sequence_seqres if mmcif_obj.sequence_seqres else mmcif_obj.sequence_atom
-    sqrres_path = save_seqres(code, chain_id, seqres, seqres_dir, duplicate)
-    logging.info(f"SEQRES saved to {sqrres_path}!")
+    seqres_entries = format_seqres(code, chain_id, seqres, duplicate)
 
     # Remove clashes and low pLDDT regions for each template
     mmcif_obj.remove_clashes(threshold_clashes, hb_allowance)
@@ -158,6 +158,8 @@ def _prepare_template(template, code, chain_id, mmcif_dir, seqres_dir, templates
         validate_and_fix_mmcif(fn)
         logging.info(f'{new_template} processed with code {temp_code}!')
 
+    return seqres_entries
+
 
 def create_db(out_path, templates, chains, threshold_clashes, hb_allowance, plddt_threshold):
     """
@@ -181,16 +183,22 @@ def create_db(out_path, templates, chains, threshold_clashes, hb_allowance, pldd
 
     create_tree(pdb_mmcif_dir, mmcif_dir, seqres_dir, templates_dir)
 
-    # Process each template/chain pair
+    # Process each template/chain pair, buffering SEQRES entries in memory
+    seqres_entries = []
     for template, chain_id in zip(templates, chains):
         template=Path(template)
         code = parse_code(template)
         logging.info(f"Template code: {code}")
         assert len(code) == 4
-        _prepare_template(
-            template, code, chain_id, mmcif_dir, seqres_dir, templates_dir,
+        seqres_entries.append(_prepare_template(
+            template, code, chain_id, mmcif_dir, templates_dir,
             threshold_clashes, hb_allowance, plddt_threshold, len(templates)
-        )
+        ))
+
+    # Write pdb_seqres.txt once instead of re-opening it per chain
+    seqres_path = seqres_dir / 'pdb_seqres.txt'
+    seqres_path.write_text(''.join(seqres_entries))
+    logging.info(f"SEQRES saved to {seqres_path}!")
 
 
 def main(argv):
@@ -41,6 +41,8 @@ def extract_seqs(template, chain_id):
                     sequence_atom = str(record.seq)
                 elif format_type.endswith('seqres'):
                     sequence_seqres = str(record.seq)
+                # target chain found, no need to parse the remaining records
+                break
     if sequence_atom is None:
         logging.error(f"No atom sequence found for chain {chain_id}")
     if sequence_seqres is None:
@@ -209,21 +211,19 @@ class MmcifChainFiltered:
         new_structure = Structure.Structure(f"struct_{chain_id}")
         new_model = model.__class__(model.id, new_structure)
         new_structure.add(new_model)
-        resis = list(protein_letters_3to1.keys())
         residues_to_remove = []
 
         for chain in model:
             if chain.id == chain_id:
-                seq = ''
+                seq_letters = []
                 for resi in chain:
-                    if resi.resname not in resis:
+                    one_letter = protein_letters_3to1.get(resi.resname)
+                    if one_letter is None:
+                        logging.info(f'Skipping residue {resi.resname} with id {resi.id}, chain {chain_id}')
                         residues_to_remove.append(resi)
                         continue
-                    try:
-                        one_letter = protein_letters_3to1[resi.resname]
-                        seq += one_letter
-                    except KeyError:
-                        logging.info(f'Skipping residue {resi.resname} with id {resi.id}, chain {chain_id}')
+                    seq_letters.append(one_letter)
+                seq = ''.join(seq_letters)
 
                 for resi in residues_to_remove:
                     chain.detach_child(resi.id)
@@ -9,17 +9,24 @@ from alphapulldown.analysis_pipeline.get_good_inter_pae import obtain_seq_length
 
 class TestGetGoodInterPae(absltest.TestCase):
     @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.os.path.exists')
-    @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.PDBParser.get_structure')
-    @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.PPBuilder.build_peptides')
-    def test_obtain_seq_lengths(self, mock_build_peptides, mock_get_structure, mock_exists):
+    def test_obtain_seq_lengths(self, mock_exists):
         mock_exists.return_value = True
-        mock_get_structure.return_value = MagicMock()
-        mock_build_peptides.return_value = [MagicMock(get_sequence=MagicMock(return_value='AAAA'))]
+        pdb_data = (
+            b"ATOM      1  N   ALA A   1      11.104   6.134  -6.504  1.00  0.00           N\n"
+            b"ATOM      2  CA  ALA A   1      11.639   6.071  -5.147  1.00  0.00           C\n"
+            b"ATOM      3  C   ALA A   1      12.345   7.364  -4.803  1.00  0.00           C\n"
+            b"ATOM      4  CA  GLY A   2      13.543   7.406  -3.882  1.00  0.00           C\n"
+            b"TER\n"
+            b"ATOM      5  CA  MET B   1      14.204   8.840  -3.777  1.00  0.00           C\n"
+            b"END\n"
+        )
 
-        result = obtain_seq_lengths('/fake/dir')
-        self.assertEqual(result, [4])
+        with patch('builtins.open', mock_open(read_data=pdb_data)):
+            result = obtain_seq_lengths('/fake/dir')
+        self.assertEqual(result, [2, 1])
 
-    @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.os.listdir')
+    @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.ProcessPoolExecutor')
+    @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.os.scandir')
     @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.os.path.isfile')
     @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.PDBAnalyser')
     @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.obtain_pae_and_iptm')
@@ -29,8 +36,15 @@ class TestGetGoodInterPae(absltest.TestCase):
     @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.pd.DataFrame.to_csv')
     @patch('alphapulldown.analysis_pipeline.get_good_inter_pae.os.makedirs')
     def test_main(self, mock_makedirs, mock_to_csv, mock_obtain_mpdockq, mock_examine_inter_pae,
-                  mock_obtain_seq_lengths, mock_obtain_pae_and_iptm, mock_PDBAnalyser, mock_isfile, mock_listdir):
-        mock_listdir.return_value = ['job1']
+                  mock_obtain_seq_lengths, mock_obtain_pae_and_iptm, mock_PDBAnalyser, mock_isfile,
+                  mock_scandir, mock_executor):
+        job_entry = MagicMock()
+        job_entry.name = 'job1'
+        job_entry.is_dir.return_value = True
+        mock_scandir.return_value.__enter__.return_value = iter([job_entry])
+        # run the pool serially so the patched functions stay in effect
+        mock_executor.return_value.__enter__.return_value.map.side_effect = \
+            lambda fn, iterable: list(map(fn, iterable))
         mock_isfile.return_value = True
         mock_obtain_pae_and_iptm.return_value = (MagicMock(), 0.5)
         mock_obtain_seq_lengths.return_value = [100, 100]
@@ -140,11 +140,14 @@ class TestPDBAnalyser(absltest.TestCase):
         pd.testing.assert_frame_equal(updated_df, expected_df)
 
     @patch('alphapulldown.analysis_pipeline.pdb_analyser.subprocess.run')
-    @patch('alphapulldown.analysis_pipeline.pdb_analyser.os.listdir')
+    @patch('alphapulldown.analysis_pipeline.pdb_analyser.os.scandir')
     @patch('alphapulldown.analysis_pipeline.pdb_analyser.pd.read_csv')
-    def test_run_and_summarise_pi_score_success(self, mock_read_csv, mock_listdir, mock_subprocess_run):
+    def test_run_and_summarise_pi_score_success(self, mock_read_csv, mock_scandir, mock_subprocess_run):
         mock_subprocess_run.return_value = MagicMock(returncode=0, stderr=b'', stdout=b'')
-        mock_listdir.return_value = ['filter_intf_features.csv']
+        csv_entry = MagicMock()
+        csv_entry.name = 'filter_intf_features.csv'
+        csv_entry.is_file.return_value = True
+        mock_scandir.return_value.__enter__.return_value = iter([csv_entry])
         mock_read_csv.return_value = pd.DataFrame({'interface': ['A_B'], 'value': [1]})
 
         result = self.analyser.run_and_summarise_pi_score(
@@ -157,10 +160,10 @@ class TestPDBAnalyser(absltest.TestCase):
         self.assertIn('value', result.columns)
 
     @patch('alphapulldown.analysis_pipeline.pdb_analyser.subprocess.run')
-    @patch('alphapulldown.analysis_pipeline.pdb_analyser.os.listdir')
-    def test_run_and_summarise_pi_score_no_csv(self, mock_listdir, mock_subprocess_run):
+    @patch('alphapulldown.analysis_pipeline.pdb_analyser.os.scandir')
+    def test_run_and_summarise_pi_score_no_csv(self, mock_scandir, mock_subprocess_run):
         mock_subprocess_run.return_value = MagicMock(returncode=0, stderr=b'', stdout=b'')
-        mock_listdir.return_value = []
+        mock_scandir.return_value.__enter__.return_value = iter([])
 
         result = self.analyser.run_and_summarise_pi_score(
             work_dir='/fake/dir',
@@ -186,11 +189,14 @@ class TestPDBAnalyser(absltest.TestCase):
         pd.testing.assert_frame_equal(result.reset_index(drop=True), expected_df)
 
     @patch('alphapulldown.analysis_pipeline.pdb_analyser.subprocess.run')
-    @patch('alphapulldown.analysis_pipeline.pdb_analyser.os.listdir')
+    @patch('alphapulldown.analysis_pipeline.pdb_analyser.os.scandir')
     @patch('alphapulldown.analysis_pipeline.pdb_analyser.pd.read_csv')
-    def test_run_and_summarise_pi_score_empty_csv(self, mock_subprocess_run, mock_listdir, mock_read_csv):
+    def test_run_and_summarise_pi_score_empty_csv(self, mock_read_csv, mock_scandir, mock_subprocess_run):
         mock_subprocess_run.return_value = MagicMock(returncode=0, stderr=b'', stdout=b'')
-        mock_listdir.return_value = ['filter_intf_features.csv']
+        csv_entry = MagicMock()
+        csv_entry.name = 'filter_intf_features.csv'
+        csv_entry.is_file.return_value = True
+        mock_scandir.return_value.__enter__.return_value = iter([csv_entry])
         mock_read_csv.side_effect = pd.errors.EmptyDataError('No data')
 
         result = self.analyser.run_and_summarise_pi_score(